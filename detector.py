@@ -4,33 +4,54 @@ AI-Generated Code Vulnerability Detection
 A simple pattern-based vulnerability detector for Python and JavaScript code.
 """
 
+import re
 import sys
 import json
-import re
+import argparse
+import functools
+import itertools
+import concurrent.futures
+from typing import Any, Optional
 
+try:
+    # RE2 matches in linear time, so hostile input cannot trigger backtracking
+    import re2  # type: ignore
+except ImportError:
+    re2 = None  # type: ignore
 
-def detect_vulnerabilities(code: str, language: str) -> dict:
-    """
-    Analyze code for common security vulnerabilities.
-    
-    Args:
-        code: The source code to analyze
-        language: Programming language ('python' or 'javascript')
-    
-    Returns:
-        dict with vulnerability, severity, explanation, and patch
-    """
-    language = language.lower()
-    
-    # Define vulnerability patterns for each language
-    patterns = {
-        'python': [
-            {
-                'pattern': r'\beval\s*\(',
-                'vulnerability': 'Code Injection (eval)',
-                'severity': 'High',
-                'explanation': 'The eval() function executes arbitrary Python code from a string. If user input is passed to eval(), an attacker can execute malicious code, potentially gaining full control of the system.',
-                'patch': '''# Instead of eval(), use safer alternatives:
+try:
+    # Hyperscan checks every pattern in a single SIMD pass over the input
+    import hyperscan  # type: ignore
+except ImportError:
+    hyperscan = None  # type: ignore
+
+try:
+    # Aho-Corasick finds every trigger literal in a single pass
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None  # type: ignore
+
+try:
+    # orjson parses and serializes JSON several times faster than the json module
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+
+# Vulnerability patterns for each language. Repetitions that can run to the end
+# of a line are bounded to 500 characters so failed attempts give up early.
+# Patterns are listed from most to least commonly hit, since that order is also
+# the order of the alternatives in the combined regex. Patterns are written in
+# lowercase and matched against case-folded code, so no IGNORECASE is needed.
+_PATTERNS: dict[str, tuple[dict[str, Any], ...]] = {
+    'python': (
+        {
+            'pattern': r'\beval\s*\(',
+            'triggers': ('eval',),
+            'vulnerability': 'Code Injection (eval)',
+            'severity': 'High',
+            'explanation': 'The eval() function executes arbitrary Python code from a string. If user input is passed to eval(), an attacker can execute malicious code, potentially gaining full control of the system.',
+            'patch': '''# Instead of eval(), use safer alternatives:
 # For mathematical expressions:
 import ast
 result = ast.literal_eval(user_input)  # Only evaluates literals
@@ -40,78 +61,84 @@ import json
 result = json.loads(user_input)
 
 # For simple calculations, use a dedicated parser or whitelist allowed operations'''
-            },
-            {
-                'pattern': r'\bexec\s*\(',
-                'vulnerability': 'Code Injection (exec)',
-                'severity': 'High',
-                'explanation': 'The exec() function executes arbitrary Python statements. This is extremely dangerous when combined with user input as it allows complete code execution.',
-                'patch': '''# Avoid exec() entirely when possible
-# If you need to run dynamic code, consider:
-# 1. Using a configuration file instead of dynamic code
-# 2. Implementing a restricted DSL (Domain Specific Language)
-# 3. Using subprocess with strict input validation for external scripts'''
-            },
-            {
-                'pattern': r'\.execute\s*\(\s*["\'].*%|\.execute\s*\(\s*.*\+|\.execute\s*\(\s*f["\']',
-                'vulnerability': 'SQL Injection',
-                'severity': 'Critical',
-                'explanation': 'Building SQL queries by concatenating or formatting user input allows attackers to inject malicious SQL commands, potentially accessing, modifying, or deleting database data.',
-                'patch': '''# Use parameterized queries instead:
+        },
+        {
+            'pattern': r'(password|secret|api_key|token)\s*=\s*["\'][^"\']+["\']',
+            'triggers': ('password', 'secret', 'api_key', 'token'),
+            'vulnerability': 'Hardcoded Credentials',
+            'severity': 'High',
+            'explanation': 'Storing passwords, API keys, or secrets directly in source code exposes them to anyone with access to the codebase and makes rotation difficult.',
+            'patch': '''# Use environment variables:
+import os
+password = os.environ.get('DB_PASSWORD')
+api_key = os.environ.get('API_KEY')
+
+# Or use a secrets management service like:
+# - AWS Secrets Manager
+# - HashiCorp Vault
+# - Azure Key Vault'''
+        },
+        {
+            'pattern': r'\.execute\s*\(\s*(?:["\'].{0,500}%|.{0,500}\+|f["\'])',
+            'triggers': ('.execute',),
+            'vulnerability': 'SQL Injection',
+            'severity': 'Critical',
+            'explanation': 'Building SQL queries by concatenating or formatting user input allows attackers to inject malicious SQL commands, potentially accessing, modifying, or deleting database data.',
+            'patch': '''# Use parameterized queries instead:
 # BAD:  cursor.execute(f"SELECT * FROM users WHERE id = {user_id}")
 # GOOD: cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
 
 # Or use an ORM like SQLAlchemy:
 # user = session.query(User).filter(User.id == user_id).first()'''
-            },
-            {
-                'pattern': r'pickle\.loads?\s*\(',
-                'vulnerability': 'Insecure Deserialization',
-                'severity': 'Critical',
-                'explanation': 'Pickle can deserialize arbitrary Python objects, including malicious ones. Unpickling untrusted data can lead to remote code execution.',
-                'patch': '''# Use safer serialization formats:
+        },
+        {
+            'pattern': r'\bexec\s*\(',
+            'triggers': ('exec',),
+            'vulnerability': 'Code Injection (exec)',
+            'severity': 'High',
+            'explanation': 'The exec() function executes arbitrary Python statements. This is extremely dangerous when combined with user input as it allows complete code execution.',
+            'patch': '''# Avoid exec() entirely when possible
+# If you need to run dynamic code, consider:
+# 1. Using a configuration file instead of dynamic code
+# 2. Implementing a restricted DSL (Domain Specific Language)
+# 3. Using subprocess with strict input validation for external scripts'''
+        },
+        {
+            'pattern': r'pickle\.loads?\s*\(',
+            'triggers': ('pickle.load',),
+            'vulnerability': 'Insecure Deserialization',
+            'severity': 'Critical',
+            'explanation': 'Pickle can deserialize arbitrary Python objects, including malicious ones. Unpickling untrusted data can lead to remote code execution.',
+            'patch': '''# Use safer serialization formats:
 import json
 data = json.loads(user_data)  # For JSON data
 
 # If you must use pickle, only load from trusted sources
 # and consider using hmac to verify data integrity'''
-            },
-            {
-                'pattern': r'(password|secret|api_key|token)\s*=\s*["\'][^"\']+["\']',
-                'vulnerability': 'Hardcoded Credentials',
-                'severity': 'High',
-                'explanation': 'Storing passwords, API keys, or secrets directly in source code exposes them to anyone with access to the codebase and makes rotation difficult.',
-                'patch': '''# Use environment variables:
-import os
-password = os.environ.get('DB_PASSWORD')
-api_key = os.environ.get('API_KEY')
-
-# Or use a secrets management service like:
-# - AWS Secrets Manager
-# - HashiCorp Vault
-# - Azure Key Vault'''
-            },
-            {
-                'pattern': r'subprocess\.(call|run|Popen)\s*\([^)]*shell\s*=\s*True',
-                'vulnerability': 'Command Injection',
-                'severity': 'Critical',
-                'explanation': 'Using shell=True with subprocess allows shell injection attacks. User input can include shell metacharacters to execute arbitrary commands.',
-                'patch': '''# Avoid shell=True and pass arguments as a list:
+        },
+        {
+            'pattern': r'subprocess\.(call|run|popen)\s*\([^)]{0,500}shell\s*=\s*true',
+            'triggers': ('subprocess.',),
+            'vulnerability': 'Command Injection',
+            'severity': 'Critical',
+            'explanation': 'Using shell=True with subprocess allows shell injection attacks. User input can include shell metacharacters to execute arbitrary commands.',
+            'patch': '''# Avoid shell=True and pass arguments as a list:
 # BAD:  subprocess.run(f"ls {user_dir}", shell=True)
 # GOOD: subprocess.run(["ls", user_dir])
 
 # If shell features are needed, validate and sanitize input:
 import shlex
 safe_input = shlex.quote(user_input)'''
-            }
-        ],
-        'javascript': [
-            {
-                'pattern': r'\beval\s*\(',
-                'vulnerability': 'Code Injection (eval)',
-                'severity': 'High',
-                'explanation': 'The eval() function executes arbitrary JavaScript code. If user input reaches eval(), attackers can execute malicious scripts in the browser or server context.',
-                'patch': '''// Instead of eval(), use safer alternatives:
+        }
+    ),
+    'javascript': (
+        {
+            'pattern': r'\beval\s*\(',
+            'triggers': ('eval',),
+            'vulnerability': 'Code Injection (eval)',
+            'severity': 'High',
+            'explanation': 'The eval() function executes arbitrary JavaScript code. If user input reaches eval(), attackers can execute malicious scripts in the browser or server context.',
+            'patch': '''// Instead of eval(), use safer alternatives:
 // For JSON parsing:
 const data = JSON.parse(userInput);
 
@@ -119,13 +146,28 @@ const data = JSON.parse(userInput);
 const value = obj[propertyName];
 
 // For mathematical expressions, use a safe parser library like math.js'''
-            },
-            {
-                'pattern': r'\.innerHTML\s*=',
-                'vulnerability': 'Cross-Site Scripting (XSS)',
-                'severity': 'High',
-                'explanation': 'Setting innerHTML with user-controlled content allows attackers to inject malicious scripts that execute in victims\' browsers, stealing cookies, sessions, or performing actions on their behalf.',
-                'patch': '''// Use textContent for plain text:
+        },
+        {
+            'pattern': r'(password|secret|apikey|token)\s*[:=]\s*["\'][^"\']+["\']',
+            'triggers': ('password', 'secret', 'apikey', 'token'),
+            'vulnerability': 'Hardcoded Credentials',
+            'severity': 'High',
+            'explanation': 'Storing secrets in source code exposes them in version control and client-side bundles.',
+            'patch': '''// Use environment variables:
+const apiKey = process.env.API_KEY;
+
+// For frontend apps, use build-time injection:
+const apiKey = process.env.REACT_APP_API_KEY;
+
+// Never commit .env files - add to .gitignore'''
+        },
+        {
+            'pattern': r'\.innerhtml\s*=',
+            'triggers': ('.innerhtml',),
+            'vulnerability': 'Cross-Site Scripting (XSS)',
+            'severity': 'High',
+            'explanation': 'Setting innerHTML with user-controlled content allows attackers to inject malicious scripts that execute in victims\' browsers, stealing cookies, sessions, or performing actions on their behalf.',
+            'patch': '''// Use textContent for plain text:
 element.textContent = userInput;
 
 // Or use DOM methods to create elements safely:
@@ -135,51 +177,41 @@ container.appendChild(div);
 
 // If HTML is needed, sanitize with DOMPurify:
 element.innerHTML = DOMPurify.sanitize(userInput);'''
-            },
-            {
-                'pattern': r'(query|execute)\s*\(\s*[`"\'].*\$\{|\.query\s*\(\s*.*\+',
-                'vulnerability': 'SQL Injection',
-                'severity': 'Critical',
-                'explanation': 'Building SQL queries by concatenating or interpolating user input allows attackers to inject malicious SQL commands.',
-                'patch': '''// Use parameterized queries:
+        },
+        {
+            'pattern': r'(query|execute)\s*\(\s*[`"\'].{0,500}\$\{|\.query\s*\(\s*.{0,500}\+',
+            'triggers': ('query', 'execute'),
+            'vulnerability': 'SQL Injection',
+            'severity': 'Critical',
+            'explanation': 'Building SQL queries by concatenating or interpolating user input allows attackers to inject malicious SQL commands.',
+            'patch': '''// Use parameterized queries:
 // BAD:  db.query(`SELECT * FROM users WHERE id = ${userId}`)
 // GOOD: db.query('SELECT * FROM users WHERE id = ?', [userId])
 
 // Or use an ORM like Sequelize or Prisma:
 const user = await User.findByPk(userId);'''
-            },
-            {
-                'pattern': r'child_process\.(exec|execSync)\s*\(',
-                'vulnerability': 'Command Injection',
-                'severity': 'Critical',
-                'explanation': 'The exec functions run shell commands. If user input is included, attackers can inject additional commands using shell metacharacters.',
-                'patch': '''// Use execFile or spawn instead of exec:
+        },
+        {
+            'pattern': r'child_process\.(exec|execsync)\s*\(',
+            'triggers': ('child_process.',),
+            'vulnerability': 'Command Injection',
+            'severity': 'Critical',
+            'explanation': 'The exec functions run shell commands. If user input is included, attackers can inject additional commands using shell metacharacters.',
+            'patch': '''// Use execFile or spawn instead of exec:
 const { execFile } = require('child_process');
 execFile('ls', [userDir], (error, stdout) => {
   // handle output
 });
 
 // Always validate and sanitize user input before use'''
-            },
-            {
-                'pattern': r'(password|secret|apiKey|token)\s*[:=]\s*["\'][^"\']+["\']',
-                'vulnerability': 'Hardcoded Credentials',
-                'severity': 'High',
-                'explanation': 'Storing secrets in source code exposes them in version control and client-side bundles.',
-                'patch': '''// Use environment variables:
-const apiKey = process.env.API_KEY;
-
-// For frontend apps, use build-time injection:
-const apiKey = process.env.REACT_APP_API_KEY;
-
-// Never commit .env files - add to .gitignore'''
-            },
-            {
-                'pattern': r'document\.write\s*\(',
-                'vulnerability': 'DOM-based XSS',
-                'severity': 'Medium',
-                'explanation': 'document.write() can introduce XSS vulnerabilities and causes performance issues by blocking parsing.',
-                'patch': '''// Use modern DOM manipulation instead:
+        },
+        {
+            'pattern': r'document\.write\s*\(',
+            'triggers': ('document.write',),
+            'vulnerability': 'DOM-based XSS',
+            'severity': 'Medium',
+            'explanation': 'document.write() can introduce XSS vulnerabilities and causes performance issues by blocking parsing.',
+            'patch': '''// Use modern DOM manipulation instead:
 const container = document.getElementById('output');
 container.textContent = userContent;
 
@@ -187,12 +219,362 @@ container.textContent = userContent;
 const p = document.createElement('p');
 p.textContent = userContent;
 document.body.appendChild(p);'''
-            }
-        ]
-    }
+        }
+    )
+}
+
+
+# Common spellings of supported languages resolve with a single dict lookup,
+# so only unusual casings pay for language.lower()
+_LANGUAGE_ALIASES: dict[str, str] = {
+    'python': 'python',
+    'Python': 'python',
+    'PYTHON': 'python',
+    'javascript': 'javascript',
+    'JavaScript': 'javascript',
+    'JAVASCRIPT': 'javascript',
+    'js': 'javascript'
+}
+
+
+def _index_triggers(vulns: tuple[dict[str, Any], ...]) -> dict[str, tuple[int, ...]]:
+    """Map each trigger literal to the indices of the patterns that need it."""
+    index: dict[str, list[int]] = {}
+    for i, vuln in enumerate(vulns):
+        for trigger in vuln['triggers']:
+            index.setdefault(trigger, []).append(i)
+    return {trigger: tuple(indices) for trigger, indices in index.items()}
+
+
+# Each pattern's 'triggers' are lowercase literals, at least one of which must
+# appear in any code it matches; patterns whose triggers are all absent are skipped
+_LITERAL_TRIGGERS: dict[str, dict[str, tuple[int, ...]]] = {
+    language: _index_triggers(vulns) for language, vulns in _PATTERNS.items()
+}
+
+
+def _build_automaton(triggers: dict[str, tuple[int, ...]]) -> Any:
+    """Build an Aho-Corasick automaton yielding pattern indices per trigger."""
+    automaton = ahocorasick.Automaton()
+    for trigger, indices in triggers.items():
+        automaton.add_word(trigger, indices)
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATONS: dict[str, Any] = (
+    {language: _build_automaton(triggers) for language, triggers in _LITERAL_TRIGGERS.items()}
+    if ahocorasick else {}
+)
+
+# Every character Python's \s matches in str patterns, as literal characters so
+# engines whose own \s is ASCII-only read the class the same way
+_SPACE_CLASS = '[\t-\r\x1c-\x20\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]'
+
+for _vulns in _PATTERNS.values():
+    for _vuln in _vulns:
+        # The fields reported for a finding, gathered once so a result only
+        # needs the matching lines added
+        _vuln['result'] = {
+            'vulnerability': _vuln['vulnerability'],
+            'severity': _vuln['severity'],
+            'explanation': _vuln['explanation'],
+            'patch': _vuln['patch']
+        }
+
+
+def _compile_patterns(
+    compile: Any, pattern_of: Any
+) -> tuple[dict[str, Any], dict[str, tuple[Any, ...]]]:
+    """
+    Compile the combined and per-pattern regexes of every language with one engine.
+    
+    Each pattern is compiled once at import so searches skip the engine's cache
+    lookup. The combined alternation lets clean code be scanned once instead of
+    once per pattern; its group g<i> corresponds to _PATTERNS[language][i].
+    
+    Args:
+        compile: The engine's compile function
+        pattern_of: Maps a pattern entry to the expression to compile
+    
+    Returns:
+        tuple of (combined regex, per-pattern regexes) dicts keyed by language
+    """
+    combined: dict[str, Any] = {}
+    compiled: dict[str, tuple[Any, ...]] = {}
+    for language, vulns in _PATTERNS.items():
+        patterns = [pattern_of(vuln) for vuln in vulns]
+        combined[language] = compile(
+            '|'.join(f"(?P<g{i}>{pattern})" for i, pattern in enumerate(patterns))
+        )
+        compiled[language] = tuple(compile(pattern) for pattern in patterns)
+    # Run every compiled pattern once so any lazy matcher setup happens at
+    # import instead of inside the first request
+    for language in _PATTERNS:
+        combined[language].search('')
+        for regex in compiled[language]:
+            regex.search('')
+    return combined, compiled
+
+
+# Patterns are str regexes matched against str code: requests arrive decoded,
+# and bytes regexes would give \s and \b ASCII-only meanings.
+_COMBINED, _COMPILED = _compile_patterns(re.compile, lambda vuln: vuln['pattern'])
+
+# RE2's \s and \b are ASCII-only. Its copies spell out Python's \s class, and
+# _scan only hands RE2 ASCII code, where its \b agrees with re's.
+_RE2_COMBINED, _RE2_COMPILED = (
+    _compile_patterns(re2.compile, lambda vuln: vuln['pattern'].replace(r'\s', _SPACE_CLASS))
+    if re2 else ({}, {})
+)
+
+
+def _hyperscan_expression(pattern: str) -> bytes:
+    """
+    Rewrite a pattern so Hyperscan matches a superset of what re matches.
+    
+    Hyperscan rejects \\b in UCP mode and without UCP its \\s is ASCII-only, so
+    \\s becomes the explicit Unicode whitespace class and \\b is dropped. Bounded
+    gaps such as .{0,500} are too large to compile in UTF-8 mode and widen to .*;
+    the per-line re pass still enforces the exact pattern.
+    """
+    pattern = re.sub(r'\.\{0,\d+\}', '.*', pattern)
+    return pattern.replace(r'\s', _SPACE_CLASS).replace(r'\b', '').encode('utf-8')
+
+
+def _build_hyperscan_db(vulns: tuple[dict[str, Any], ...]) -> Any:
+    """Compile one block-mode Hyperscan database whose ids index into vulns."""
+    flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[_hyperscan_expression(vuln['pattern']) for vuln in vulns],
+        ids=list(range(len(vulns))),
+        elements=len(vulns),
+        flags=[flags] * len(vulns)
+    )
+    return db
+
+
+# The database allocates its scratch space on compile, so it is reused per scan
+_HYPERSCAN_DBS: dict[str, Any] = (
+    {language: _build_hyperscan_db(vulns) for language, vulns in _PATTERNS.items()}
+    if hyperscan else {}
+)
+
+
+# Importing Numba and loading its JIT cache takes hundreds of milliseconds, while
+# code.casefold() plus every trigger check takes about 7 ms per MiB. The scanner is
+# therefore only enabled in long-lived --batch processes, which pay that cost
+# once, and even there only for inputs at least this long (in characters). It
+# folds ASCII case only, so it is limited to ASCII code, where that is exact.
+_NUMBA_MIN_SIZE = 1 << 20
+_numba_enabled = False
+
+
+def _enable_numba_scanner() -> None:
+    """Let large inputs use the Numba trigger scanner in this process."""
+    global _numba_enabled
+    _numba_enabled = True
+
+
+def _find_triggers(data: Any, table: Any, offsets: Any, found: Any) -> None:
+    """
+    Mark in found each trigger that occurs in data, folding ASCII case.
+    
+    Written for Numba: data and table are uint8 arrays, trigger t is
+    table[offsets[t]:offsets[t + 1]] and is already lowercase.
+    """
+    n = len(data)
+    count = len(offsets) - 1
+    remaining = count
+    for pos in range(n):
+        first = data[pos]
+        if 65 <= first <= 90:
+            first |= 0x20
+        for t in range(count):
+            if found[t]:
+                continue
+            start = offsets[t]
+            length = offsets[t + 1] - start
+            if table[start] != first or pos + length > n:
+                continue
+            j = 1
+            while j < length:
+                byte = data[pos + j]
+                if 65 <= byte <= 90:
+                    byte |= 0x20
+                if byte != table[start + j]:
+                    break
+                j += 1
+            if j == length:
+                found[t] = True
+                remaining -= 1
+                if remaining == 0:
+                    return
+
+
+@functools.lru_cache(maxsize=None)
+def _load_numba_scanner() -> Any:
+    """JIT-compile _find_triggers on first use, or return None without Numba."""
+    # mypyc-compiled builds leave no bytecode for Numba to compile
+    if not hasattr(_find_triggers, '__code__'):
+        return None
+    try:
+        import numba  # type: ignore
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_find_triggers)
+
+
+@functools.lru_cache(maxsize=None)
+def _trigger_table(language: str) -> tuple[tuple[str, ...], Any, Any]:
+    """Pack a language's trigger literals into the arrays _find_triggers expects."""
+    import numpy as np  # type: ignore
+    
+    triggers = tuple(_LITERAL_TRIGGERS[language])
+    table = np.frombuffer(''.join(triggers).encode('ascii'), dtype=np.uint8)
+    offsets = np.cumsum([0] + [len(trigger) for trigger in triggers])
+    return triggers, table, offsets
+
+
+def _numba_candidates(scanner: Any, code: str, language: str) -> set[int]:
+    """Find trigger literals in ASCII code in one compiled pass without folding it."""
+    import numpy as np  # type: ignore
+    
+    triggers, table, offsets = _trigger_table(language)
+    data = np.frombuffer(code.encode('ascii'), dtype=np.uint8)
+    found = np.zeros(len(triggers), dtype=np.bool_)
+    scanner(data, table, offsets, found)
+    
+    candidates: set[int] = set()
+    for trigger, present in zip(triggers, found):
+        if present:
+            candidates.update(_LITERAL_TRIGGERS[language][trigger])
+    return candidates
+
+
+def _literal_candidates(code_folded: str, language: str) -> set[int]:
+    """Return the indices of the patterns whose trigger literals occur in code_folded."""
+    candidates: set[int] = set()
+    if _AUTOMATONS:
+        for _, indices in _AUTOMATONS[language].iter(code_folded):
+            candidates.update(indices)
+    else:
+        for trigger, indices in _LITERAL_TRIGGERS[language].items():
+            if trigger in code_folded:
+                candidates.update(indices)
+    return candidates
+
+
+def _hyperscan_hits(code: str, language: str) -> set[int]:
+    """Return the indices of the patterns that match anywhere in code."""
+    hits: set[int] = set()
+    
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        hits.add(pattern_id)
+    
+    # Lone surrogates are not valid UTF-8, which HS_FLAG_UTF8 requires
+    _HYPERSCAN_DBS[language].scan(
+        code.encode('utf-8', 'replace'), match_event_handler=on_match
+    )
+    return hits
+
+
+# The cache bounds entries, not bytes, and each entry keeps its code alive, so
+# only snippets up to this many characters are cached (at most ~16M in total)
+_CACHE_MAX_SIZE = 16 * 1024
+
+
+@functools.lru_cache(maxsize=1024)
+def _scan(code: str, language: str) -> tuple[tuple[int, tuple[int, ...]], ...]:
+    """
+    Find the lines matched by each pattern of a supported language.
+    
+    Results for snippets up to _CACHE_MAX_SIZE are cached for the life of the
+    process. The editor extension spawns a new process per analysis, so only a
+    long-lived --batch run sees repeated snippets and gains from the cache.
+    Results are returned as tuples so cached entries stay immutable.
+    
+    Returns:
+        tuple of (pattern index, line numbers) pairs in pattern order
+    """
+    # Literal triggers narrow the patterns worth running before any regex work.
+    # Every later stage matches lowercase patterns against one case-folded copy;
+    # casefold() rather than lower() so characters such as U+017F fold to 's'.
+    scanner = None
+    if _numba_enabled and len(code) >= _NUMBA_MIN_SIZE and code.isascii():
+        scanner = _load_numba_scanner()
+    if scanner is not None:
+        # Large inputs are checked before paying for the case-folded copy
+        candidates = _numba_candidates(scanner, code, language)
+        if candidates:
+            code = code.casefold()
+    else:
+        code = code.casefold()
+        candidates = _literal_candidates(code, language)
+    if not candidates:
+        return ()
+    
+    # RE2 agrees with re on ASCII code only, so other code stays on re
+    if _RE2_COMPILED and code.isascii():
+        combined_regex, compiled = _RE2_COMBINED[language], _RE2_COMPILED[language]
+    else:
+        combined_regex, compiled = _COMBINED[language], _COMPILED[language]
+    
+    combined: Any = None
+    if _HYPERSCAN_DBS:
+        # Only patterns Hyperscan saw somewhere in the code can match a line
+        selected = sorted(candidates & _hyperscan_hits(code, language))
+    else:
+        # Nothing can match on any line if the combined pattern misses the whole code
+        combined = combined_regex
+        selected = sorted(candidates) if combined.search(code) else []
+    
+    if not selected:
+        return ()
+    
+    # Split code into lines for line number detection
+    code_lines = code.split('\n')
+    
+    # Collect ALL matching vulnerabilities with line numbers
+    matching_lines: dict[int, list[int]] = {i: [] for i in selected}
+    for line_num, line in enumerate(code_lines, start=1):
+        hit: Optional[int] = None
+        if combined is not None:
+            # Only lines hit by the combined pattern need the per-pattern checks
+            match = combined.search(line)
+            if not match:
+                continue
+            hit = int(match.lastgroup[1:])
+        
+        for i in selected:
+            if i == hit or compiled[i].search(line):
+                matching_lines[i].append(line_num)
+    
+    return tuple(
+        (i, tuple(lines)) for i, lines in matching_lines.items() if lines
+    )
+
+
+def detect_vulnerabilities(code: str, language: str) -> dict[str, Any]:
+    """
+    Analyze code for common security vulnerabilities.
+    
+    Args:
+        code: The source code to analyze
+        language: Programming language ('python' or 'javascript')
+    
+    Returns:
+        dict with vulnerability, severity, explanation, and patch
+    """
+    resolved = _LANGUAGE_ALIASES.get(language)
+    if resolved is None:
+        language = language.lower()
+        resolved = _LANGUAGE_ALIASES.get(language, language)
+    language = resolved
     
     # Check if language is supported
-    if language not in patterns:
+    if language not in _PATTERNS:
         return {
             'language': language,
             'results': [{
@@ -204,26 +586,13 @@ document.body.appendChild(p);'''
             }]
         }
     
-    # Split code into lines for line number detection
-    code_lines = code.split('\n')
-    
-    # Collect ALL matching vulnerabilities with line numbers
-    results = []
-    for vuln in patterns[language]:
-        # Find all lines that match this pattern
-        matching_lines = []
-        for line_num, line in enumerate(code_lines, start=1):
-            if re.search(vuln['pattern'], line, re.IGNORECASE):
-                matching_lines.append(line_num)
-        
-        if matching_lines:
-            results.append({
-                'vulnerability': vuln['vulnerability'],
-                'severity': vuln['severity'],
-                'explanation': vuln['explanation'],
-                'patch': vuln['patch'],
-                'lines': matching_lines
-            })
+    # Large inputs bypass the cache so it never pins whole files in memory
+    scan = _scan if len(code) <= _CACHE_MAX_SIZE else _scan.__wrapped__
+    vulns = _PATTERNS[language]
+    results = [
+        {**vulns[i]['result'], 'lines': list(lines)}
+        for i, lines in scan(code, language)
+    ]
     
     # Return results (empty array if no vulnerabilities found)
     return {
@@ -232,34 +601,74 @@ document.body.appendChild(p);'''
     }
 
 
-def main():
-    """Main entry point - reads JSON from stdin and outputs result."""
+# Shared by every empty request; it is only serialized, never modified
+_NO_CODE_ERROR: dict[str, str] = {
+    'vulnerability': 'Error',
+    'severity': 'N/A',
+    'explanation': 'No code provided for analysis.',
+    'patch': 'N/A'
+}
+
+
+def _parse_request(input_data: bytes) -> Any:
+    """Parse one JSON request from raw bytes."""
+    if orjson:
+        try:
+            return orjson.loads(input_data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some valid JSON, such as lone surrogate escapes,
+            # so only the json module gets to call input invalid
+            pass
+    return json.loads(input_data)
+
+
+def _serialize(result: dict[str, Any]) -> bytes:
+    """Encode result as compact JSON."""
+    if orjson:
+        try:
+            return orjson.dumps(result)
+        except TypeError:
+            # orjson refuses some values json can encode, such as lone surrogates
+            pass
+    return json.dumps(result, separators=(',', ':')).encode()
+
+
+def _encode_result(result: dict[str, Any]) -> bytes:
+    """Encode result as one line of compact JSON, reporting failures as an error result."""
+    try:
+        output = _serialize(result)
+    except Exception as e:
+        # Results echo the request's language, which may be any JSON value,
+        # including one nested too deeply to encode
+        output = _serialize({
+            'language': 'unknown',
+            'results': [{
+                'vulnerability': 'Error',
+                'severity': 'N/A',
+                'explanation': f'Analysis failed: {str(e)}',
+                'patch': 'N/A'
+            }]
+        })
+    return output + b'\n'
+
+
+def _handle_request(input_data: bytes) -> dict[str, Any]:
+    """Analyze one raw JSON request, reporting any failure as an error result."""
     try:
-        # Read input from stdin
-        input_data = sys.stdin.read()
-        request = json.loads(input_data)
+        request = _parse_request(input_data)
         
         code = request.get('code', '')
         language = request.get('language', '')
         
         if not code:
-            result = {
+            return {
                 'language': language or 'unknown',
-                'results': [{
-                    'vulnerability': 'Error',
-                    'severity': 'N/A',
-                    'explanation': 'No code provided for analysis.',
-                    'patch': 'N/A'
-                }]
+                'results': [_NO_CODE_ERROR]
             }
-        else:
-            result = detect_vulnerabilities(code, language)
-        
-        # Output JSON result
-        print(json.dumps(result, indent=2))
+        return detect_vulnerabilities(code, language)
         
     except json.JSONDecodeError as e:
-        error_result = {
+        return {
             'language': 'unknown',
             'results': [{
                 'vulnerability': 'Error',
@@ -268,9 +677,8 @@ def main():
                 'patch': 'N/A'
             }]
         }
-        print(json.dumps(error_result, indent=2))
     except Exception as e:
-        error_result = {
+        return {
             'language': 'unknown',
             'results': [{
                 'vulnerability': 'Error',
@@ -279,7 +687,61 @@ def main():
                 'patch': 'N/A'
             }]
         }
-        print(json.dumps(error_result, indent=2))
+
+
+def _respond(input_data: bytes) -> bytes:
+    """Analyze one raw JSON request into its line of JSON output."""
+    # Workers encode results themselves, so values too deeply nested to encode
+    # are never pickled back to the parent process
+    return _encode_result(_handle_request(input_data))
+
+
+# Requests sent to a batch worker at once, amortizing the inter-process overhead
+_BATCH_CHUNK_SIZE = 64
+
+
+def _run_batch(jobs: int) -> None:
+    """
+    Analyze newline-delimited JSON requests from stdin, one result per line.
+    
+    Blank lines are skipped. With more than one job, requests are spread over
+    a pool of worker processes that each compile the patterns only once.
+    """
+    _enable_numba_scanner()
+    # filter() stays lazy when compiled; mypyc builds generator expressions as lists
+    requests = filter(bytes.strip, sys.stdin.buffer)
+    if jobs > 1:
+        # executor.map submits its whole input up front, so requests are handed
+        # over a window at a time to keep memory bounded on long streams
+        window = jobs * _BATCH_CHUNK_SIZE * 4
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=_enable_numba_scanner
+        ) as executor:
+            while True:
+                lines = list(itertools.islice(requests, window))
+                if not lines:
+                    break
+                for output in executor.map(_respond, lines, chunksize=_BATCH_CHUNK_SIZE):
+                    sys.stdout.buffer.write(output)
+    else:
+        for line in requests:
+            sys.stdout.buffer.write(_respond(line))
+
+
+def main() -> None:
+    """Main entry point - reads JSON from stdin and outputs result."""
+    parser = argparse.ArgumentParser(description='Detect vulnerabilities in Python and JavaScript code.')
+    parser.add_argument('--batch', action='store_true',
+                        help='read one JSON request per line and write one result per line')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='worker processes used with --batch (default: 1)')
+    args = parser.parse_args()
+    
+    if args.batch:
+        _run_batch(args.jobs)
+    else:
+        # Read a single request from stdin and output its JSON result
+        sys.stdout.buffer.write(_respond(sys.stdin.buffer.read()))
 
 
 if __name__ == '__main__':